@@ -53,6 +53,8 @@ const TestInterface: React.FC = () => {
   const canvasRef = useRef<HTMLCanvasElement>(null);
   const testContainerRef = useRef<HTMLDivElement>(null);
   const idleTimerRef = useRef<NodeJS.Timeout | null>(null);
+  const audioQueueRef = useRef<string[]>([]);
+  const audioPlayingRef = useRef(false);
 
   // New: timer state (admin-controlled)
   const [timeLimitSec, setTimeLimitSec] = useState<number | null>(null);
@@ -181,26 +183,63 @@ const TestInterface: React.FC = () => {
     }
   };
 
+  // Streamed turns arrive as one audio clip per sentence; play them back to back
+  const playNextAudio = useCallback(() => {
+    const next = audioQueueRef.current.shift();
+    if (!next) {
+      audioPlayingRef.current = false;
+      return;
+    }
+    audioPlayingRef.current = true;
+
+    let advanced = false;
+    const advance = () => {
+      if (advanced) return;
+      advanced = true;
+      playNextAudio();
+    };
+    const audio = new Audio(next.startsWith('http') ? next : `${API_BASE_URL}${next}`);
+    audio.onended = advance;
+    audio.onerror = (e) => {
+      console.error('Audio playback error:', e);
+      advance();
+    };
+    audio.play().catch((e) => {
+      console.warn(e);
+      advance();
+    });
+  }, []);
+
+  const enqueueAudio = useCallback((audioUrl: string) => {
+    audioQueueRef.current.push(audioUrl);
+    if (!audioPlayingRef.current) playNextAudio();
+  }, [playNextAudio]);
+
+  // Replace the shown question with the new turn's text as it streams in
+  const streamHandlers = () => {
+    let started = false;
+    return {
+      onText: (delta: string) => {
+        if (!started) {
+          started = true;
+          setCurrentResponse(delta);
+        } else {
+          setCurrentResponse(prev => prev + delta);
+        }
+      },
+      onAudio: enqueueAudio,
+    };
+  };
+
   const startInterview = async () => {
     if (!token) return;
     setIsLoadingResponse(true);
     try {
-      const response = await apiService.startInterview(token);
+      const response = await apiService.startInterview(token, streamHandlers());
       setCurrentResponse(response.response_text);
       setCurrentQuestionNumber(1);
       setQuestionsRemaining(response.questions_remaining || (totalQuestions - 1));
       setIsWaitingForAnswer(true);
-
-      // Play audio if available
-      if (response.audio_url) {
-        const audioUrl = response.audio_url.startsWith('http')
-          ? response.audio_url
-          : `${API_BASE_URL}${response.audio_url}`;
-
-        const audio = new Audio(audioUrl);
-        audio.onerror = (e) => console.error('Audio playback error:', e);
-        audio.play().catch(console.warn);
-      }
     } catch (err) {
       console.error('Interview start error:', err);
       notification.error({
@@ -228,7 +267,7 @@ const TestInterface: React.FC = () => {
     setIsWaitingForAnswer(false);
 
     try {
-      const submitResponse = await apiService.submitTextAnswer(token, text);
+      const submitResponse = await apiService.submitTextAnswer(token, text, streamHandlers());
 
       // Check if interview is complete
       if (submitResponse.is_complete) {
@@ -257,16 +296,6 @@ const TestInterface: React.FC = () => {
       setIsWaitingForAnswer(true);
       setPendingAnswer('');
 
-      // Play audio for next question
-      if (submitResponse.audio_url) {
-        const audioUrl = submitResponse.audio_url.startsWith('http')
-          ? submitResponse.audio_url
-          : `${API_BASE_URL}${submitResponse.audio_url}`;
-
-        const audio = new Audio(audioUrl);
-        audio.play().catch(console.warn);
-      }
-
     } catch (err: any) {
       console.error('Submit answer error:', err);
 
@@ -55,6 +55,11 @@ interface InterviewResponse {
   is_complete?: boolean;
 }
 
+interface InterviewStreamHandlers {
+  onText?: (delta: string) => void;
+  onAudio?: (audioUrl: string) => void;
+}
+
 interface TranscribeResponse {
   transcription: string;
 }
@@ -143,17 +148,77 @@ class ApiService {
     });
   }
 
-  async startInterview(token: string): Promise<InterviewResponse> {
-    return this.fetchWithAuth(`/api/test/${token}/start-interview`, {
-      method: 'POST',
+  // Reads an interview turn as server-sent events: text deltas and sentence audio
+  // clips arrive as they are generated, then `done` carries the turn status.
+  private async streamInterviewTurn(url: string, options: RequestInit, handlers: InterviewStreamHandlers): Promise<InterviewResponse> {
+    const response = await fetch(`${API_BASE_URL}${url}`, {
+      ...options,
+      headers: {
+        'Content-Type': 'application/json',
+        'Accept': 'text/event-stream',
+      },
     });
+
+    if (!response.ok) {
+      const errorData = await response.json().catch(() => ({}));
+      throw new Error(errorData.error || errorData.message || `HTTP error! status: ${response.status}`);
+    }
+    if (!response.body) {
+      throw new Error('Streaming is not supported by this browser');
+    }
+
+    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+    let buffer = '';
+    let responseText = '';
+    let firstAudioUrl = '';
+    let status: Omit<InterviewResponse, 'response_text' | 'audio_url'> | null = null;
+
+    while (true) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += value;
+      const events = buffer.split('\n\n');
+      buffer = events.pop() ?? '';
+
+      for (const rawEvent of events) {
+        let event = 'message';
+        let data = '';
+        for (const line of rawEvent.split('\n')) {
+          if (line.startsWith('event: ')) event = line.slice(7);
+          else if (line.startsWith('data: ')) data += line.slice(6);
+        }
+        if (!data) continue;
+        const payload = JSON.parse(data);
+
+        if (event === 'text') {
+          responseText += payload.delta;
+          handlers.onText?.(payload.delta);
+        } else if (event === 'audio') {
+          firstAudioUrl ||= payload.audio_url;
+          handlers.onAudio?.(payload.audio_url);
+        } else if (event === 'done') {
+          status = payload;
+        }
+      }
+    }
+
+    if (!status) {
+      throw new Error('Interview stream ended before the turn completed');
+    }
+    return { ...status, response_text: responseText, audio_url: firstAudioUrl };
   }
 
-  async submitTextAnswer(token: string, text: string): Promise<InterviewResponse> {
-    return this.fetchWithAuth(`/api/test/${token}/submit-text`, {
+  async startInterview(token: string, handlers: InterviewStreamHandlers = {}): Promise<InterviewResponse> {
+    return this.streamInterviewTurn(`/api/test/${token}/start-interview`, {
+      method: 'POST',
+    }, handlers);
+  }
+
+  async submitTextAnswer(token: string, text: string, handlers: InterviewStreamHandlers = {}): Promise<InterviewResponse> {
+    return this.streamInterviewTurn(`/api/test/${token}/submit-text`, {
       method: 'POST',
       body: JSON.stringify({ text }),
-    });
+    }, handlers);
   }
 
   async transcribeAudio(token: string, audioBlob: Blob): Promise<TranscribeResponse> {
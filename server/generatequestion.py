@@ -1,12 +1,25 @@
 
 import os
-import json
+import asyncio
+import orjson
+import httpx
 import openai
 from dotenv import load_dotenv
 import re
 import logging
-from typing import Tuple, Optional, Dict, List
+import textwrap
+import functools
+import threading
+import msgpack
+import redis.asyncio as redis
+from concurrent.futures import ThreadPoolExecutor, Future
+from contextlib import asynccontextmanager
+from weakref import WeakValueDictionary
+from redis.exceptions import LockError
+from dataclasses import dataclass, field, asdict, replace
+from typing import Tuple, Optional, Dict, List, AsyncIterator
 from datetime import datetime
+from cachetools import TTLCache
 
 load_dotenv()
 
@@ -14,81 +27,243 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Set OpenAI API configuration
-openai.api_key = os.getenv("OPENAI_API_KEY")
+# Set OpenAI API configuration. One client (and one keep-alive HTTP/2 pool) is shared
+# by chat, TTS and Whisper calls so connections are set up once, not per request.
+# httpx.Limits must match the HTTP library the SDK is built on, so requirements.txt
+# pins openai to 1.x.
+client = openai.AsyncOpenAI(
+    api_key=os.getenv("OPENAI_API_KEY"),
+    timeout=httpx.Timeout(30.0, connect=5.0),
+    http_client=openai.DefaultAsyncHttpxClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=200, max_keepalive_connections=100)
+    )
+)
+
+# Shared state lives in Redis when REDIS_URL is set, so any worker can serve any
+# candidate. Without it, state is kept in this process (single worker only).
+REDIS_URL = os.getenv("REDIS_URL")
+redis_client = redis.from_url(REDIS_URL) if REDIS_URL else None
+
+def pack(value) -> bytes:
+    return msgpack.packb(value)
+
+def unpack(raw: bytes):
+    # Stage maps use integer keys
+    return msgpack.unpackb(raw, strict_map_key=False)
+
+# Model per task; questions and summaries both fit comfortably in a small model
+MODELS = {
+    "question": "gpt-4o-mini",
+    "summary": "gpt-4o-mini",
+}
+
+# Fixed phrases spoken to the candidate; their audio can be synthesized ahead of time
+THINKING_MESSAGE = "Let me think about your next question..."
+CLOSING_MESSAGE = "Thank you for completing the interview. Your responses have been recorded"
 
 # ============= IMPROVED SYSTEM PROMPT =============
-def build_system_prompt(config: dict) -> dict:
+# The instructions are identical for every interview and come first, so OpenAI's
+# automatic prompt caching can reuse the prefix; only the configuration varies.
+SYSTEM_PROMPT_INSTRUCTIONS = textwrap.dedent('''
+    You are an AI interviewer conducting a structured technical interview at CapsiTech.
+
+    CRITICAL INSTRUCTIONS:
+    1. You must ask EXACTLY the configured number of technical questions - no more, no less.
+    2. Keep track of question numbers explicitly (Question 1, Question 2, etc.)
+    3. DO NOT count greetings, introductions, or transitions as questions.
+    4. Only statements that require a technical answer count as questions.
+
+    Interview Flow:
+    1. First message: Brief greeting and ask Question 1
+    2. After each answer: Provide brief feedback and ask the next question
+    3. Adjust difficulty based on answer quality:
+       - Good answer → Increase difficulty
+       - Poor answer → Maintain or decrease difficulty
+    4. After the final answer: Provide summary ONLY, no more questions
+
+    Question Format:
+    Internally track questions as "Question X:" but DO NOT include this prefix in your response to the candidate.
+    Just ask the question directly.
+    Example: "Question 1: Can you explain the difference between..."
+
+    Rating Scale (internal use):
+    0-1: No understanding
+    2-3: Basic understanding with gaps
+    4: Good understanding
+    5: Excellent with examples
+''').strip()
+
+@functools.lru_cache(maxsize=256)
+def _build_system_prompt_cached(num_questions, experience_level, difficulty, role_subject) -> dict:
+    # Shared between sessions, so callers must not mutate the returned message
     return {
         "role": "system",
-        "content": f'''
-        You are an AI interviewer conducting a structured technical interview at CapsiTech.
-        
-        CRITICAL INSTRUCTIONS:
-        1. You must ask EXACTLY {config.get("num_questions")} technical questions - no more, no less.
-        2. Keep track of question numbers explicitly (Question 1, Question 2, etc.)
-        3. DO NOT count greetings, introductions, or transitions as questions.
-        4. Only statements that require a technical answer count as questions.
-        
-        Interview Configuration:
-        - Candidate's experience level: {config.get("experience_level")}
-        - Total questions to ask: {config.get("num_questions")}
-        - Difficulty level: {config.get("difficulty")}
-        - Role: {config.get("role_subject")}
-        
-        Interview Flow:
-        1. First message: Brief greeting and ask Question 1
-        2. After each answer: Provide brief feedback and ask the next question
-        3. Adjust difficulty based on answer quality:
-           - Good answer → Increase difficulty
-           - Poor answer → Maintain or decrease difficulty
-        4. After the final answer: Provide summary ONLY, no more questions
-        
-        Question Format:
-        Internally track questions as "Question X:" but DO NOT include this prefix in your response to the candidate.
-        Just ask the question directly.
-        Example: "Question 1: Can you explain the difference between..."
-        
-        Rating Scale (internal use):
-        0-1: No understanding
-        2-3: Basic understanding with gaps
-        4: Good understanding
-        5: Excellent with examples
-        '''
+        "content": (
+            f"{SYSTEM_PROMPT_INSTRUCTIONS}\n\n"
+            "Interview Configuration:\n"
+            f"- Candidate's experience level: {experience_level}\n"
+            f"- Total questions to ask: {num_questions}\n"
+            f"- Difficulty level: {difficulty}\n"
+            f"- Role: {role_subject}"
+        )
     }
 
-# ============= ENHANCED SESSION MANAGEMENT =============
-interview_sessions = {}  # Store complete interview state
+def build_system_prompt(config: dict) -> dict:
+    return _build_system_prompt_cached(
+        config.get("num_questions"),
+        config.get("experience_level"),
+        config.get("difficulty"),
+        config.get("role_subject")
+    )
 
-def initialize_interview_session(token: str, config: dict):
+# ============= ENHANCED SESSION MANAGEMENT =============
+# Only the most recent messages are sent verbatim; older turns are folded into a
+# short running summary so each request stays a constant size.
+HISTORY_WINDOW = 4
+
+@dataclass(slots=True)
+class InterviewSession:
+    """Complete state of one candidate's interview"""
+    config: dict
+    chat_history: List[Dict] = field(default_factory=list)     # Recent turns only, see HISTORY_WINDOW
+    rolling_summary: str = ""                                   # One line per turn that has left the window
+    actual_questions_asked: int = 0                             # Track only real questions
+    actual_questions: List[str] = field(default_factory=list)  # Store the actual questions
+    answers: List[str] = field(default_factory=list)           # Store candidate answers
+    ratings: List[float] = field(default_factory=list)         # Store ratings for each answer
+    is_complete: bool = False
+    current_state: str = "greeting"                             # greeting -> questioning -> complete
+    started_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    completed_at: Optional[str] = None
+    final_summary: Optional[Dict] = None
+
+    @property
+    def system_prompt(self) -> dict:
+        return build_system_prompt(self.config)
+
+# Sessions are dropped after SESSION_TTL so abandoned interviews don't pile up.
+# The in-process fallback is only touched from the event loop thread.
+SESSION_TTL = 6 * 3600
+interview_sessions = TTLCache(maxsize=10_000, ttl=SESSION_TTL)
+
+async def save_interview_session(token: str, session: InterviewSession):
+    """Persist the session after it has been mutated"""
+    if redis_client:
+        await redis_client.set(f"sess:{token}", pack(asdict(session)), ex=SESSION_TTL)
+    else:
+        interview_sessions[token] = session
+
+# One answer may be processed per interview at a time, so a double-clicked Submit or
+# a retried request can't run (and pay for) a second turn on the same state.
+ANSWER_IN_PROGRESS = "Answer already being processed"
+ANSWER_LOCK_TTL = 30
+_answer_locks: "WeakValueDictionary[str, asyncio.Lock]" = WeakValueDictionary()
+
+@asynccontextmanager
+async def answer_lock(token: str):
+    """Hold the token's answer lock; yields False if another request already holds it"""
+    if redis_client:
+        lock = redis_client.lock(f"lock:{token}", timeout=ANSWER_LOCK_TTL)
+        acquired = await lock.acquire(blocking=False)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                try:
+                    await lock.release()
+                except LockError:
+                    logger.warning(f"Answer lock for {token} expired before release")
+        return
+
+    lock = _answer_locks.setdefault(token, asyncio.Lock())
+    if lock.locked():
+        yield False
+        return
+    async with lock:
+        yield True
+
+async def initialize_interview_session(token: str, config: dict) -> InterviewSession:
     """Initialize a new interview session with proper tracking"""
-    system_prompt = build_system_prompt(config)
-    
-    interview_sessions[token] = {
-        "config": config,
-        "system_prompt": system_prompt,
-        "chat_history": [system_prompt],
-        "actual_questions_asked": 0,  # Track only real questions
-        "actual_questions": [],       # Store the actual questions
-        "answers": [],                 # Store candidate answers
-        "ratings": [],                 # Store ratings for each answer
-        "is_complete": False,
-        "current_state": "greeting",  # greeting -> questioning -> complete
-        "started_at": datetime.now().isoformat()
-    }
+    session = InterviewSession(config=config)
+    await save_interview_session(token, session)
     
     logger.info(f"Initialized interview session for token: {token}")
-    return interview_sessions[token]
+    return session
 
-def get_interview_session(token: str) -> Optional[Dict]:
+async def get_interview_session(token: str) -> Optional[InterviewSession]:
     """Get the current interview session"""
+    if redis_client:
+        raw = await redis_client.get(f"sess:{token}")
+        return InterviewSession(**unpack(raw)) if raw else None
     return interview_sessions.get(token)
 
+def _context_messages(session: InterviewSession, *tail: Dict) -> List[Dict]:
+    """System prompt, running summary and the recent turns, followed by `tail`, as one list"""
+    summary = (
+        [{"role": "system", "content": "Earlier in this interview:\n" + session.rolling_summary}]
+        if session.rolling_summary else []
+    )
+    return [session.system_prompt, *summary, *session.chat_history, *tail]
+
+def _record_turn(session: InterviewSession, answer: str, ai_response: str):
+    """Append the latest exchange and fold the previous one into the running summary"""
+    history = session.chat_history
+    history.append({"role": "user", "content": answer})
+    history.append({"role": "assistant", "content": ai_response})
+    del history[:-HISTORY_WINDOW]
+
+    previous = len(session.answers) - 1
+    if previous >= 1:
+        question = session.actual_questions[previous - 1]
+        earlier_answer = session.answers[previous - 1]
+        session.rolling_summary += f"Q{previous}: {question[:120]} | A: {earlier_answer[:80]}\n"
+
 # ============= CORE INTERVIEW FUNCTIONS =============
 
-def start_structured_interview(token: str, config: dict) -> str:
-    """Start the interview with greeting and first question."""
-    session = initialize_interview_session(token, config)
+# "Question N: ..." marker the model may still include despite instructions
+QUESTION_RE = re.compile(r'Question\s*(\d+)\s*:(.*?)(?:\n|$)', re.IGNORECASE | re.DOTALL)
+
+def _extract_question(ai_response: str) -> str:
+    """Pull the question text out of a response for logging"""
+    question_match = QUESTION_RE.search(ai_response)
+    if question_match:
+        return question_match.group(2).strip()
+    return ai_response  # Save full text if format doesn't match
+
+async def _stream_completion(token: str, messages: List[Dict], max_tokens: int, question_num: int) -> AsyncIterator[str]:
+    """Yield the assistant's content deltas for the turn asking `question_num`."""
+    response = await client.chat.completions.create(
+        model=MODELS["question"],
+        messages=messages,
+        temperature=0.7,
+        max_tokens=max_tokens,
+        # Stop before the model runs on into the question after this one
+        stop=[f"Question {question_num + 1}:"],
+        stream=True,
+        stream_options={"include_usage": True},
+        # Route every turn of an interview to the same prompt cache
+        extra_body={"prompt_cache_key": token}
+    )
+    async for chunk in response:
+        if chunk.usage:
+            _log_cache_usage(chunk.usage)
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            yield delta
+
+
+def _log_cache_usage(usage):
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = getattr(details, "cached_tokens", 0) or 0
+    logger.info(f"Prompt tokens: {usage.prompt_tokens} ({cached} cached)")
+
+
+async def stream_structured_interview(token: str, config: dict) -> AsyncIterator[str]:
+    """Start the interview, yielding the greeting + first question as it streams."""
+    session = await initialize_interview_session(token, config)
     
     # Create initial prompt for greeting + first question
     initial_prompt = f"""
@@ -100,58 +275,65 @@ def start_structured_interview(token: str, config: dict) -> str:
     Remember: do not number the question in the final message to the candidate.
     """
     
-    messages = [session["system_prompt"], {"role": "user", "content": initial_prompt}]
+    messages = [session.system_prompt, {"role": "user", "content": initial_prompt}]
     
-    response = openai.chat.completions.create(
-        model="gpt-3.5-turbo",
-        messages=messages,
-        temperature=0.7,
-        max_tokens=200
-    )
-    ai_response = response.choices[0].message.content.strip()
+    parts = []
+    async for delta in _stream_completion(token, messages, max_tokens=120, question_num=1):
+        parts.append(delta)
+        yield delta
+    ai_response = "".join(parts).strip()
     
     # Try to extract the actual question for logging
-    question_match = re.search(r'Question\s*1:(.*?)(?:\n|$)', ai_response, re.IGNORECASE | re.DOTALL)
-    if question_match:
-        actual_question = question_match.group(1).strip()
-    else:
-        actual_question = ai_response  # Save full text if format doesn't match
+    actual_question = _extract_question(ai_response)
     
     print(f"AI Response: {actual_question}")
     # Always set count to 1 for the first question
-    session["actual_questions"].append(actual_question)
-    session["actual_questions_asked"] = 1
-    session["current_state"] = "questioning"
+    session.actual_questions.append(actual_question)
+    session.actual_questions_asked = 1
+    session.current_state = "questioning"
     
     # Save chat history
-    session["chat_history"].append({"role": "user", "content": initial_prompt})
-    session["chat_history"].append({"role": "assistant", "content": ai_response})
-    
-    return ai_response
+    session.chat_history.append({"role": "user", "content": initial_prompt})
+    session.chat_history.append({"role": "assistant", "content": ai_response})
+    await save_interview_session(token, session)
+
+
+async def start_structured_interview(token: str, config: dict) -> str:
+    """Start the interview with greeting and first question."""
+    return "".join([delta async for delta in stream_structured_interview(token, config)]).strip()
 
 
-def process_answer_and_get_next(token: str, answer: str) -> Dict:
-    session = get_interview_session(token)
+async def check_answer_allowed(token: str) -> Optional[Dict]:
+    """Return an error dict if the session cannot take another answer."""
+    session = await get_interview_session(token)
     if not session:
         return {"error": "Session not found"}
-    if session["is_complete"]:
+    if session.is_complete:
         return {"error": "Interview already complete"}
+    return None
 
-    config = session["config"]
-    max_questions = int(config.get("num_questions", 5))
-    current_q_num = session["actual_questions_asked"]
 
-    # Store the answer
-    session["answers"].append(answer)
+async def stream_answer_and_get_next(token: str, answer: str) -> AsyncIterator[str]:
+    """Record the answer and yield the next question (or closing message) as it streams.
+
+    Callers must hold answer_lock() and run check_answer_allowed() first.
+    """
+    session = await get_interview_session(token)
+    config = session.config
+    max_questions = int(config.get("num_questions", 5))
+    current_q_num = session.actual_questions_asked
 
     # If we've already reached the limit, end the interview
     if current_q_num >= max_questions:
-        return generate_final_summary(token, answer)
+        session.answers.append(answer)
+        yield (await generate_final_summary(token, session, answer))["response_text"]
+        return
 
-    # Now we know we can ask the next question
+    # Now we know we can ask the next question. Without Redis the session is the live
+    # cached object, so it is only updated once the stream has finished: a dropped
+    # connection or API error leaves the turn unrecorded, as it is with Redis.
     next_q_num = current_q_num + 1
-    session["actual_questions_asked"] = next_q_num
-    print(session["actual_questions"])
+    print(session.actual_questions)
     prompt = f"""
     The candidate just answered Question {current_q_num}.
     Their answer was: "{answer}"
@@ -165,50 +347,74 @@ def process_answer_and_get_next(token: str, answer: str) -> Dict:
     """
     print(answer)
 
-    messages = session["chat_history"].copy()
-    messages.append({"role": "user", "content": answer})
-    messages.append({"role": "system", "content": prompt})
+    messages = _context_messages(
+        session,
+        {"role": "user", "content": answer},
+        {"role": "system", "content": prompt}
+    )
     print("!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
     print(f"Processing answer for question {current_q_num}: {answer}")
 
-    response = openai.chat.completions.create(
-        model="gpt-3.5-turbo",
-        messages=messages,
-        temperature=0.7,
-        max_tokens=200
-    )
-    ai_response = response.choices[0].message.content.strip()
+    parts = []
+    async for delta in _stream_completion(token, messages, max_tokens=80, question_num=next_q_num):
+        parts.append(delta)
+        yield delta
+    ai_response = "".join(parts).strip()
 
-    
-    # Log the question
-    question_match = re.search(rf'Question {next_q_num}:(.*?)(?:\n|$)', ai_response, re.IGNORECASE | re.DOTALL)
-    if question_match:
-        actual_question = question_match.group(1).strip()
-    else:
-        actual_question = ai_response
-    session["actual_questions"].append(actual_question)
+    # Store the answer and log the question
+    session.answers.append(answer)
+    session.actual_questions_asked = next_q_num
+    actual_question = _extract_question(ai_response)
+    session.actual_questions.append(actual_question)
 
     # Save to history
-    session["chat_history"].append({"role": "assistant", "content": ai_response})
+    _record_turn(session, answer, ai_response)
+    await save_interview_session(token, session)
+
+
+async def process_answer_and_get_next(token: str, answer: str) -> Dict:
+    async with answer_lock(token) as acquired:
+        if not acquired:
+            return {"error": ANSWER_IN_PROGRESS}
+        error = await check_answer_allowed(token)
+        if error:
+            return error
+
+        response_text = "".join([delta async for delta in stream_answer_and_get_next(token, answer)]).strip()
+    progress = await get_interview_progress(token)
 
     return {
-        "response_text": ai_response,
-        "question_number": next_q_num,
-        "is_complete": False,
-        "questions_remaining": max_questions - next_q_num
+        "response_text": response_text,
+        "question_number": progress["current_question"],
+        "is_complete": progress["is_complete"],
+        "questions_remaining": progress["questions_remaining"]
     }
 
 
 
-def generate_final_summary(token: str, final_answer: str) -> Dict:
-    """Generate the final interview summary"""
-    session = get_interview_session(token)
-    if not session:
-        return {"error": "Session not found"}
-    
+# Structured output schema for the final summary, enforced by the API
+SUMMARY_SCHEMA = {
+    "name": "interview_summary",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "overall_feedback": {"type": "string"},
+            "strengths": {"type": "array", "items": {"type": "string"}},
+            "areas_for_improvement": {"type": "array", "items": {"type": "string"}},
+            "average_rating": {"type": "number"}
+        },
+        "required": ["overall_feedback", "strengths", "areas_for_improvement", "average_rating"],
+        "additionalProperties": False
+    }
+}
+
+async def generate_final_summary(token: str, session: InterviewSession, final_answer: str) -> Dict:
+    """Complete the interview and queue its summary for the Batch API"""
+
     # Rate all answers
     prompt = f"""
-The interview is complete. The candidate answered all {session['actual_questions_asked']} questions.
+The interview is complete. The candidate answered all {session.actual_questions_asked} questions.
 
 Their final answer was: "{final_answer}".
 
@@ -232,63 +438,112 @@ Important:
 - Ensure the JSON is valid and properly formatted.
 """
     
-    messages = session["chat_history"].copy()
-    messages.append({"role": "user", "content": final_answer})
-    messages.append({"role": "system", "content": prompt})
-    
-    response = openai.chat.completions.create(
-        model="gpt-3.5-turbo",
-        messages=messages,
-        temperature=0.7,
-        max_tokens=300
+    # Rating needs every answer, so send a compact transcript rather than the chat history
+    transcript = "\n\n".join(
+        f"Question {i + 1}: {question}\nAnswer: {answer}"
+        for i, (question, answer) in enumerate(zip(session.actual_questions, session.answers))
     )
+    messages = [
+        session.system_prompt,
+        {"role": "user", "content": transcript},
+        {"role": "system", "content": prompt}
+    ]
+    
+    # Nobody waits on the summary, so it goes through the (half price) Batch API;
+    # summary_batches.py submits the queue and writes results into the log.
+    summary_request = {
+        "model": MODELS["summary"],
+        "messages": messages,
+        "temperature": 0.7,
+        "max_tokens": 300,
+        "response_format": {"type": "json_schema", "json_schema": SUMMARY_SCHEMA},
+        "prompt_cache_key": token
+    }
+    
+    # Mark session as complete
+    session.is_complete = True
+    session.current_state = "complete"
+    session.completed_at = datetime.now().isoformat()
+    # The conversation context is no longer needed once the interview is over
+    session.chat_history.clear()
+    session.rolling_summary = ""
+    await save_interview_session(token, session)
     
-    summary = response.choices[0].message.content.strip()
+    # Save to file in the background; the candidate doesn't wait on the disk
+    log_executor.submit(save_interview_log, token, replace(session)).add_done_callback(_log_write_failure)
+    log_executor.submit(
+        queue_summary_request, interview_log_path(token, session.config), summary_request
+    ).add_done_callback(_log_write_failure)
+    
+    return {
+        "response_text": CLOSING_MESSAGE,
+        "question_number": session.actual_questions_asked,
+        "is_complete": True
+    }
 
+def parse_summary(summary: Optional[str]) -> Dict:
+    """Decode the model's summary, keeping the raw text if it isn't valid JSON"""
     try:
-        summary_data = json.loads(summary)
-    except json.JSONDecodeError:
+        return orjson.loads(summary)
+    except orjson.JSONDecodeError:
+        # SUMMARY_SCHEMA rules this out except for refusals
         logger.warning("Failed to parse structured summary JSON, saving raw text instead.")
-        summary_data = {
-            "overall_feedback": summary,
+        return {
+            "overall_feedback": summary or "",
             "strengths": [],
             "areas_for_improvement": [],
             "average_rating": None
         }
-    
-    # Mark session as complete
-    session["is_complete"] = True
-    session["current_state"] = "complete"
-    session["final_summary"] = summary_data
-    session["completed_at"] = datetime.now().isoformat()
-    
-    # Save to file
-    save_interview_log(token, session)
-    
-    return {
-        "response_text": "Thank you for completing the interview. Your responses have been recorded",
-        "question_number": session["actual_questions_asked"],
-        "is_complete": True,
-        "internal_summary": summary
-    }
 
-def save_interview_log(token: str, session: Dict):
+log_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="interview-log")
+
+PENDING_SUMMARIES_PATH = "pending_summaries.jsonl"
+_pending_summaries_lock = threading.Lock()
+
+def _log_write_failure(future: Future):
+    if future.exception():
+        logger.error(f"Failed to write interview data: {future.exception()}")
+
+def queue_summary_request(log_path: str, body: Dict):
+    """Append a Batch API request line; the log path doubles as its custom_id"""
+    line = orjson.dumps({
+        "custom_id": log_path,
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": body
+    }) + b"\n"
+    with _pending_summaries_lock, open(PENDING_SUMMARIES_PATH, "ab") as f:
+        f.write(line)
+
+SAFE_NAME_RE = re.compile(r'[^A-Za-z0-9_-]+')
+
+def make_safe_name(candidate_name: Optional[str]) -> str:
+    """Filesystem-safe form of a candidate's name, used for their log directory"""
+    return SAFE_NAME_RE.sub("_", candidate_name or "unknown").strip("_").lower() or "unknown"
+
+def candidate_log_dir(config: Dict) -> str:
+    # Configs created before safe_name was stored fall back to computing it
+    safe_name = config.get("safe_name") or make_safe_name(config.get("candidate_name"))
+    return os.path.join("interview_logs", safe_name)
+
+def interview_log_path(token: str, config: Dict) -> str:
+    return os.path.join(candidate_log_dir(config), f"interview_{token}.json")
+
+def save_interview_log(token: str, session: InterviewSession):
     """Save the complete interview log"""
-    config = session["config"]
-    safe_name = config.get("candidate_name", "unknown").replace(" ", "_").lower()
-    
-    os.makedirs(f"interview_logs/{safe_name}", exist_ok=True)
-    log_path = f"interview_logs/{safe_name}/interview_{token}.json"
+    config = session.config
+    log_path = interview_log_path(token, config)
+    os.makedirs(os.path.dirname(log_path), exist_ok=True)
     
     log_data = {
     "metadata": {
         "token": token,
-        "started_at": session.get("started_at"),
-        "completed_at": session.get("completed_at"),
+        "started_at": session.started_at,
+        "completed_at": session.completed_at,
         "duration_minutes": (
-            datetime.fromisoformat(session.get("completed_at"))
-            - datetime.fromisoformat(session.get("started_at"))
-        ).seconds // 60 if session.get("completed_at") else None
+            datetime.fromisoformat(session.completed_at)
+            - datetime.fromisoformat(session.started_at)
+        ).seconds // 60 if session.completed_at else None
     },
     "candidate": {
         "name": config.get("candidate_name"),
@@ -304,55 +559,65 @@ def save_interview_log(token: str, session: Dict):
     "interview": [
         {
             "question_number": i + 1,
-            "question": session["actual_questions"][i],
-            "answer": session["answers"][i] if i < len(session["answers"]) else None,
-            "rating": session["ratings"][i] if i < len(session["ratings"]) else None
+            "question": session.actual_questions[i],
+            "answer": session.answers[i] if i < len(session.answers) else None,
+            "rating": session.ratings[i] if i < len(session.ratings) else None
         }
-        for i in range(session["actual_questions_asked"])
+        for i in range(session.actual_questions_asked)
     ],
-    "summary": session.get("final_summary", {
+    "summary": session.final_summary or {
         "overall_feedback": "",
         "strengths": [],
         "areas_for_improvement": [],
         "average_rating": None
-    })
+    }
 }
     
-    with open(log_path, "w") as f:
-        json.dump(log_data, f, indent=2)
+    with open(log_path, "wb") as f:
+        f.write(orjson.dumps(log_data, option=orjson.OPT_INDENT_2))
     
     logger.info(f"Interview log saved to {log_path}")
 
 # ============= HELPER FUNCTIONS =============
 
-def get_interview_progress(token: str) -> Dict:
+async def is_final_answer(token: str) -> bool:
+    """Whether the next answer submitted completes the interview"""
+    session = await get_interview_session(token)
+    if not session:
+        return False
+    return session.actual_questions_asked >= int(session.config.get("num_questions", 5))
+
+async def get_interview_progress(token: str) -> Dict:
     """Get current interview progress"""
-    session = get_interview_session(token)
+    session = await get_interview_session(token)
     if not session:
         return {"error": "Session not found"}
     
-    config = session["config"]
+    config = session.config
     max_questions = int(config.get("num_questions", 5))
     
     return {
-        "current_question": session["actual_questions_asked"],
+        "current_question": session.actual_questions_asked,
         "total_questions": max_questions,
-        "questions_remaining": max_questions - session["actual_questions_asked"],
-        "is_complete": session["is_complete"],
-        "state": session["current_state"]
+        "questions_remaining": max_questions - session.actual_questions_asked,
+        "is_complete": session.is_complete,
+        "state": session.current_state
     }
 
-def reset_interview(token: str):
+async def reset_interview(token: str):
     """Reset an interview session"""
-    if token in interview_sessions:
-        del interview_sessions[token]
+    if redis_client:
+        removed = await redis_client.delete(f"sess:{token}")
+    else:
+        removed = interview_sessions.pop(token, None)
+    if removed:
         logger.info(f"Interview session reset for token: {token}")
 
 # ============= TEXT TO SPEECH (Keep existing) =============
-def text_to_speech(text: str) -> Optional[bytes]:
+async def text_to_speech(text: str) -> Optional[bytes]:
     """Convert text to speech using OpenAI TTS."""
     try:
-        response = openai.audio.speech.create(
+        response = await client.audio.speech.create(
             model="tts-1",
             voice="alloy",
             input=text
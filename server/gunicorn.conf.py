@@ -0,0 +1,19 @@
+# gunicorn -c gunicorn.conf.py main:asgi_app
+import os
+import multiprocessing
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+worker_class = "uvicorn_worker.UvicornWorker"
+
+# Sessions only survive across workers when they are kept in Redis
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() if os.getenv("REDIS_URL") else 1))
+
+# Each worker starts its own event loop thread and OpenAI/Redis clients on import,
+# so the app must be loaded after forking
+preload_app = False
+
+# Heartbeat timeout: a worker that stops checking in with the arbiter for this long
+# is killed and restarted. It does not limit how long a request (or SSE stream) runs.
+timeout = 120
+graceful_timeout = 30
+keepalive = 5
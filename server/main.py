@@ -1,21 +1,50 @@
-from flask import Flask, request, send_from_directory, jsonify, send_file, session, abort
+from flask import Flask, Response, request, has_request_context, send_from_directory, jsonify, send_file, session, abort
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from generatequestion import (
     start_structured_interview, 
+    stream_structured_interview,
     process_answer_and_get_next,
+    stream_answer_and_get_next,
+    check_answer_allowed,
+    answer_lock,
+    ANSWER_IN_PROGRESS,
     get_interview_progress,
     get_interview_session,
     reset_interview,
-    text_to_speech
+    is_final_answer,
+    make_safe_name,
+    candidate_log_dir,
+    text_to_speech,
+    client,
+    redis_client,
+    pack,
+    unpack,
+    SESSION_TTL,
+    THINKING_MESSAGE,
+    CLOSING_MESSAGE
 )
 import os
 import logging
+import re
 import uuid
-import json
-import tempfile
+import orjson
+import asyncio
+import aiofiles
+import hashlib
+import threading
+from io import BytesIO
+from functools import wraps
+from contextlib import AsyncExitStack
 from datetime import datetime
 from flask_mail import Mail, Message
-import openai
+from cachetools import LRUCache, TTLCache, cached
+from a2wsgi import WSGIMiddleware
+
+try:
+    import uvloop
+except ImportError:  # Not available on Windows
+    uvloop = None
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DIST_DIR = os.path.join(BASE_DIR, '..', 'client', 'dist')
@@ -23,7 +52,56 @@ print("DIST_DIR ->", DIST_DIR)
 print("Exists?   ->", os.path.isdir(DIST_DIR))
 print("index.html exists? ->", os.path.exists(os.path.join(DIST_DIR, "index.html")))
 
-app = Flask(__name__, static_folder=None)
+# One long-lived event loop multiplexes every in-flight OpenAI call. Async views are
+# dispatched onto it rather than each request spinning up (and tearing down) its own
+# loop, so the shared AsyncOpenAI connection pool stays valid across requests.
+event_loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+threading.Thread(target=event_loop.run_forever, name="event-loop", daemon=True).start()
+
+def run_async(coro):
+    return asyncio.run_coroutine_threadsafe(coro, event_loop).result()
+
+_STREAM_END = object()
+
+def iterate_async(agen):
+    """Drive an async generator from a (sync) WSGI response body."""
+    async def next_item():
+        try:
+            return await agen.__anext__()
+        except StopAsyncIteration:
+            return _STREAM_END
+
+    try:
+        while (item := run_async(next_item())) is not _STREAM_END:
+            yield item
+    finally:
+        run_async(agen.aclose())
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Serialize request and response bodies with orjson"""
+    def dumps(self, obj, **kwargs):
+        # Stage maps use integer keys
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+class AsyncFlask(Flask):
+    def async_to_sync(self, func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            # Read the body here, in the request's own thread, so no coroutine on
+            # event_loop ever blocks on the client's upload
+            if has_request_context():
+                if request.mimetype in ('multipart/form-data', 'application/x-www-form-urlencoded'):
+                    request.form
+                else:
+                    request.get_data(cache=True)
+            return run_async(func(*args, **kwargs))
+        return wrapper
+
+app = AsyncFlask(__name__, static_folder=None)
+app.json = OrjsonProvider(app)
 app.secret_key = os.getenv('SECRET_KEY', 'your-secret-key-here')
 CORS(app, supports_credentials=True, origins=['http://localhost:5173'])
 app.config.from_object('config')  
@@ -32,12 +110,35 @@ mail = Mail(app)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-test_data_storage = {}
+# Test configs are cached from uploads/ and shared by request threads, so guard
+# them with store_lock.
+store_lock = threading.RLock()
+test_data_storage = TTLCache(maxsize=5000, ttl=3600)
+
+# Per-token stage state and violation counts live in Redis when configured (see
+# generatequestion.redis_client); otherwise in these caches, which are only
+# touched from the event loop. Both expire with the interview session.
 session_data = {
-    'states': {},
-    'violations': {},
+    'states': TTLCache(maxsize=10_000, ttl=SESSION_TTL),
+    'violations': TTLCache(maxsize=10_000, ttl=SESSION_TTL),
 }
 
+# Violation records are appended to each candidate's violations.jsonl in batches:
+# whichever comes first of VIOLATION_FLUSH_SIZE records or VIOLATION_FLUSH_INTERVAL.
+VIOLATION_FLUSH_SIZE = 10
+VIOLATION_FLUSH_INTERVAL = 1.0
+violation_buffer = {}  # file path -> pending JSONL lines
+violation_flush_timer = None
+background_tasks = set()
+
+SENTENCE_END_RE = re.compile(r'(?<=[.?!])\s+')
+
+# Generated speech is served straight from memory (or Redis) instead of temp files.
+# Canned phrases are pinned so they are never evicted.
+AUDIO_TTL = 3600
+audio_cache = LRUCache(maxsize=256)
+pinned_audio = {}
+
 # ─── HELPERS ─────────────────────────────────────
 
 
@@ -59,26 +160,202 @@ def send_test_email(recipient_email: str, token: str, candidate_name: str = "Can
     msg = Message(subject=subject, recipients=[recipient_email], html=html)
     mail.send(msg)
 
+@cached(test_data_storage, key=lambda token: token, lock=store_lock)
+def read_test_config(token):
+    # A missing file raises, so unknown tokens are never cached
+    with open(f"uploads/test_{token}.json", "rb") as f:
+        config = orjson.loads(f.read())
+    # Once per cache fill, so per-request handlers can assume the directory exists
+    os.makedirs(candidate_log_dir(config), exist_ok=True)
+    return config
+
 def load_test_config(token):
-    if token in test_data_storage:
-        return test_data_storage[token]
-    path = f"uploads/test_{token}.json"
-    if os.path.exists(path):
-        with open(path) as f:
-            config = json.load(f)
-            test_data_storage[token] = config
-            return config
-    return None
-
-def get_or_create_session_state(token):
-    if token not in session_data['states']:
-        session_data['states'][token] = {
+    try:
+        return read_test_config(token)
+    except FileNotFoundError:
+        return None
+
+async def save_audio(audio_content: bytes, audio_filename: str, pinned: bool = False) -> str:
+    if pinned:
+        pinned_audio[audio_filename] = audio_content
+    if redis_client:
+        await redis_client.set(f"audio:{audio_filename}", audio_content, ex=None if pinned else AUDIO_TTL)
+    elif not pinned:
+        audio_cache[audio_filename] = audio_content
+    return f"/audio/{audio_filename}"
+
+async def load_audio(audio_filename: str):
+    if audio_filename in pinned_audio:
+        return pinned_audio[audio_filename]
+    if redis_client:
+        return await redis_client.get(f"audio:{audio_filename}")
+    return audio_cache.get(audio_filename)
+
+async def speak_sentence(text: str, audio_filename: str, pinned: bool = False):
+    audio_content = await text_to_speech(text)
+    if not audio_content:
+        return None
+    return await save_audio(audio_content, audio_filename, pinned)
+
+async def speak_canned(text: str, audio_filename: str):
+    """Synthesize a fixed phrase once and reuse its audio for every interview."""
+    if audio_filename in pinned_audio:
+        return f"/audio/{audio_filename}"
+    return await speak_sentence(text, audio_filename, pinned=True)
+
+def warm_canned_audio():
+    """Synthesize the canned phrases in the background so no candidate waits on them"""
+    for text, audio_filename in ((THINKING_MESSAGE, 'audio_thinking.mp3'), (CLOSING_MESSAGE, 'audio_closing.mp3')):
+        asyncio.run_coroutine_threadsafe(speak_canned(text, audio_filename), event_loop)
+
+warm_canned_audio()
+
+def turn_status(result: dict) -> dict:
+    return {
+        'question_number': result.get('question_number', 0),
+        'is_complete': result.get('is_complete', False),
+        'questions_remaining': result.get('questions_remaining', 0)
+    }
+
+def wants_event_stream() -> bool:
+    return request.accept_mimetypes.best == 'text/event-stream'
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {app.json.dumps(data)}\n\n"
+
+async def stream_with_speech(token: str, deltas, done, lead_in=None):
+    """Relay text deltas as SSE and synthesize each completed sentence concurrently.
+
+    `done` is called once the deltas are exhausted and returns the final event payload.
+    `lead_in` is an optional audio task whose clip is sent before any sentence audio.
+    """
+    pending = [lead_in] if lead_in else []
+    buffer = ""
+
+    def queue_sentence(sentence):
+        audio_filename = f"audio_{token}_{uuid.uuid4().hex}.mp3"
+        pending.append(asyncio.create_task(speak_sentence(sentence, audio_filename)))
+
+    if lead_in:
+        # Canned clips are warmed at startup, so the lead-in is normally ready after one
+        # pass of the loop; send it now rather than behind the model's first token
+        await asyncio.sleep(0)
+        if lead_in.done():
+            pending.pop(0)
+            if audio_url := lead_in.result():
+                yield sse_event('audio', {'audio_url': audio_url})
+
+    async for delta in deltas:
+        yield sse_event('text', {'delta': delta})
+        buffer += delta
+        *sentences, buffer = SENTENCE_END_RE.split(buffer)
+        for sentence in sentences:
+            queue_sentence(sentence)
+        # Yield audio strictly in sentence order
+        while pending and pending[0].done():
+            audio_url = pending.pop(0).result()
+            if audio_url:
+                yield sse_event('audio', {'audio_url': audio_url})
+
+    if buffer.strip():
+        queue_sentence(buffer.strip())
+    for task in pending:
+        audio_url = await task
+        if audio_url:
+            yield sse_event('audio', {'audio_url': audio_url})
+    yield sse_event('done', await done())
+
+async def completed_turn_events(result: dict, audio_url):
+    yield sse_event('text', {'delta': result['response_text']})
+    if audio_url:
+        yield sse_event('audio', {'audio_url': audio_url})
+    yield sse_event('done', turn_status(result))
+
+async def closing_after(agen, resources: AsyncExitStack):
+    """Release `resources` once the stream finishes or the client goes away"""
+    try:
+        async for item in agen:
+            yield item
+    finally:
+        await resources.aclose()
+
+def error_status(result: dict) -> int:
+    return 409 if result["error"] == ANSWER_IN_PROGRESS else 400
+
+def event_stream_response(agen) -> Response:
+    return Response(iterate_async(agen), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+def spawn(coro):
+    """Run a coroutine in the background, keeping a reference until it finishes"""
+    task = asyncio.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
+async def flush_violations():
+    global violation_flush_timer
+    if violation_flush_timer:
+        violation_flush_timer.cancel()
+        violation_flush_timer = None
+    batches = dict(violation_buffer)
+    violation_buffer.clear()
+    for path, lines in batches.items():
+        try:
+            async with aiofiles.open(path, 'ab') as f:
+                await f.write(b"".join(lines))
+        except OSError as e:
+            logger.error(f"Failed to write violations to {path}: {e}")
+
+def buffer_violation(path, record):
+    global violation_flush_timer
+    violation_buffer.setdefault(path, []).append(orjson.dumps(record) + b"\n")
+    if sum(map(len, violation_buffer.values())) >= VIOLATION_FLUSH_SIZE:
+        spawn(flush_violations())
+    elif violation_flush_timer is None:
+        violation_flush_timer = asyncio.get_running_loop().call_later(
+            VIOLATION_FLUSH_INTERVAL, lambda: spawn(flush_violations())
+        )
+
+async def add_violation(token) -> int:
+    """Count a violation and return the candidate's running total"""
+    if redis_client:
+        key = f"violations:{token}"
+        async with redis_client.pipeline() as pipe:
+            count, _ = await pipe.incr(key).expire(key, SESSION_TTL).execute()
+        return count
+    count = session_data['violations'].get(token, 0) + 1
+    session_data['violations'][token] = count
+    return count
+
+async def violation_count(token):
+    if redis_client:
+        return int(await redis_client.get(f"violations:{token}") or 0)
+    return session_data['violations'].get(token, 0)
+
+async def save_session_state(token, state):
+    """Persist stage state after it has been mutated"""
+    if redis_client:
+        await redis_client.set(f"state:{token}", pack(state), ex=SESSION_TTL)
+    else:
+        session_data['states'][token] = state
+
+async def get_or_create_session_state(token):
+    if redis_client:
+        raw = await redis_client.get(f"state:{token}")
+        state = unpack(raw) if raw else None
+    else:
+        state = session_data['states'].get(token)
+    if state is None:
+        state = {
             'current_stage': 1,
             'stages': {1: 'incomplete', 2: 'incomplete', 3: 'incomplete'},
             'terminated': False,
             'completed': False
         }
-    return session_data['states'][token]
+        await save_session_state(token, state)
+    return state
 
 # ─── ADMIN ───────────────────────────────────────
 @app.route('/admin/create-test', methods=['POST'])
@@ -104,46 +381,56 @@ def create_test():
         "difficulty": data.get("difficulty"),
         "duration": int(data.get("duration", 60)),
         "num_questions": int(data.get("numQuestions", 5)),
+        "safe_name": make_safe_name(data.get("candidate_name")),
         "created_at": datetime.now().isoformat(),
         "status": "pending"
     }
 
+    os.makedirs(candidate_log_dir(config), exist_ok=True)
     os.makedirs("uploads", exist_ok=True)
-    with open(f"uploads/test_{token}.json", "w") as f:
-        json.dump(config, f, indent=2)
+    with open(f"uploads/test_{token}.json", "wb") as f:
+        f.write(orjson.dumps(config, option=orjson.OPT_INDENT_2))
 
-    test_data_storage[token] = config
-    get_or_create_session_state(token)
+    with store_lock:
+        test_data_storage[token] = config
+    # Stays a sync view so the SMTP send above doesn't stall the event loop
+    run_async(get_or_create_session_state(token))
 
     return jsonify({"success": True, "token": token, "test_config": config, "email_sent": True})
 
 # ─── INTERVIEW ROUTES (UPDATED) ─────────────────────────────
 
 @app.route('/api/test/<token>/start-interview', methods=['POST'])
-def start_interview(token):
+async def start_interview(token):
     """Start the interview with greeting and first question"""
     config = load_test_config(token)
     if not config:
         return jsonify({'error': 'Invalid token'}), 404
 
-    state = get_or_create_session_state(token)
+    state = await get_or_create_session_state(token)
     if state['terminated']:
         return jsonify({'error': 'Test terminated'}), 403
 
+    if wants_event_stream():
+        async def done():
+            return {
+                'question_number': 1,
+                'is_complete': False,
+                'questions_remaining': config.get('num_questions', 5) - 1
+            }
+        deltas = stream_structured_interview(token, config)
+        return event_stream_response(stream_with_speech(token, deltas, done))
+
     # Start the interview and get greeting + first question
-    first_response = start_structured_interview(token, config)
+    first_response = await start_structured_interview(token, config)
     print(f"First response: {first_response}")
     # Generate audio if needed
-    audio_content = text_to_speech(first_response)
+    audio_content = await text_to_speech(first_response)
     audio_url = None
     
     if audio_content:
         # Save audio to temp file
-        audio_filename = f"audio_{token}_q1.mp3"
-        audio_path = os.path.join(tempfile.gettempdir(), audio_filename)
-        with open(audio_path, 'wb') as f:
-            f.write(audio_content)
-        audio_url = f"/audio/{audio_filename}"
+        audio_url = await save_audio(audio_content, f"audio_{token}_q1_{uuid.uuid4().hex}.mp3")
     
     return jsonify({
         'response_text': first_response,
@@ -154,9 +441,9 @@ def start_interview(token):
     })
 
 @app.route('/api/test/<token>/submit-text', methods=['POST'])
-def submit_text_answer(token):
+async def submit_text_answer(token):
     """Submit answer and get next question or summary"""
-    interview_session = get_interview_session(token)
+    interview_session = await get_interview_session(token)
     if not interview_session:
         return jsonify({"error": "Interview not started"}), 404
 
@@ -167,62 +454,77 @@ def submit_text_answer(token):
     if not answer:
         return jsonify({'error': 'No answer provided'}), 400
 
+    if await is_final_answer(token):
+        # The closing line is fixed, so speak it while the summary is generated and saved
+        result, audio_url = await asyncio.gather(
+            process_answer_and_get_next(token, answer),
+            speak_canned(CLOSING_MESSAGE, 'audio_closing.mp3')
+        )
+        if "error" in result:
+            return jsonify(result), error_status(result)
+        if wants_event_stream():
+            return event_stream_response(completed_turn_events(result, audio_url))
+        return jsonify({"response_text": result["response_text"], "audio_url": audio_url, **turn_status(result)})
+
+    if wants_event_stream():
+        # The lock is held until the stream has been fully sent
+        resources = AsyncExitStack()
+        if not await resources.enter_async_context(answer_lock(token)):
+            await resources.aclose()
+            return jsonify({'error': ANSWER_IN_PROGRESS}), 409
+        error = await check_answer_allowed(token)
+        if error:
+            await resources.aclose()
+            return jsonify(error), 400
+        # Give the candidate something to hear while the next question is generated
+        lead_in = asyncio.create_task(speak_canned(THINKING_MESSAGE, 'audio_thinking.mp3'))
+        deltas = stream_answer_and_get_next(token, answer)
+        async def done():
+            progress = await get_interview_progress(token)
+            return {
+                'question_number': progress['current_question'],
+                'is_complete': progress['is_complete'],
+                'questions_remaining': progress['questions_remaining']
+            }
+        return event_stream_response(closing_after(stream_with_speech(token, deltas, done, lead_in), resources))
+
     # Process the answer and get next question or summary
-    result = process_answer_and_get_next(token, answer)
+    result = await process_answer_and_get_next(token, answer)
     
     if "error" in result:
-        return jsonify(result), 400
+        return jsonify(result), error_status(result)
     
     # Generate audio for response
     audio_url = None
     if result.get("response_text"):
-        audio_content = text_to_speech(result["response_text"])
+        audio_content = await text_to_speech(result["response_text"])
         if audio_content:
             q_num = result.get("question_number", 0)
-            audio_filename = f"audio_{token}_q{q_num}.mp3"
-            audio_path = os.path.join(tempfile.gettempdir(), audio_filename)
-            with open(audio_path, 'wb') as f:
-                f.write(audio_content)
-            audio_url = f"/audio/{audio_filename}"
+            audio_url = await save_audio(audio_content, f"audio_{token}_q{q_num}_{uuid.uuid4().hex}.mp3")
     
     return jsonify({
         "response_text": result.get("response_text", ""),
         "audio_url": audio_url,
-        "question_number": result.get("question_number", 0),
-        "is_complete": result.get("is_complete", False),
-        "questions_remaining": result.get("questions_remaining", 0)
+        **turn_status(result)
     })
 
 @app.route('/api/test/<token>/submit-audio', methods=['POST'])
-def submit_audio_transcribe_only(token):
+async def submit_audio_transcribe_only(token):
     if 'file' not in request.files:
         return jsonify({'error': 'No audio file provided'}), 400
 
     audio_file = request.files['file']
 
     try:
-        from tempfile import NamedTemporaryFile
-        import openai, os
-
-        with NamedTemporaryFile(delete=False, suffix='.webm') as tmp:
-            audio_file.save(tmp.name)
-            tmp_path = tmp.name
-
-        # Whisper transcription only
-        with open(tmp_path, "rb") as f:
-            tr = openai.audio.transcriptions.create(
-                model="whisper-1",
-                file=f,
-                # language="en", # optional, set if you want to force language
-            )
+        # Hand the upload stream straight to Whisper; no temp file round trip
+        audio_file.stream.seek(0)
+        tr = await client.audio.transcriptions.create(
+            model="whisper-1",
+            file=(audio_file.filename or "audio.webm", audio_file.stream, audio_file.mimetype or "audio/webm"),
+            # language="en", # optional, set if you want to force language
+        )
         text = tr.text.strip() if hasattr(tr, "text") else ""
 
-        # cleanup
-        try:
-            os.unlink(tmp_path)
-        except Exception:
-            pass
-
         return jsonify({ "transcription": text })
 
     except Exception as e:
@@ -230,17 +532,17 @@ def submit_audio_transcribe_only(token):
 
 
 @app.route('/api/test/<token>/progress', methods=['GET'])
-def get_progress(token):
+async def get_progress(token):
     """Get current interview progress"""
-    progress = get_interview_progress(token)
+    progress = await get_interview_progress(token)
     if "error" in progress:
         return jsonify(progress), 404
     return jsonify(progress)
 
 @app.route('/api/test/<token>/reset', methods=['POST'])
-def reset_interview_endpoint(token):
+async def reset_interview_endpoint(token):
     """Reset the interview (for testing)"""
-    reset_interview(token)
+    await reset_interview(token)
     return jsonify({"success": True, "message": "Interview reset"})
 
 # ─── KEEP EXISTING ROUTES ─────────────────────────────
@@ -253,12 +555,12 @@ def get_test_config(token):
     return jsonify(config)
 
 @app.route('/api/test/<token>/validate/<int:stage>', methods=['GET'])
-def validate_stage_access(token, stage):
+async def validate_stage_access(token, stage):
     config = load_test_config(token)
     if not config:
         return jsonify({'allowed': False, 'message': 'Invalid token'}), 404
 
-    state = get_or_create_session_state(token)
+    state = await get_or_create_session_state(token)
 
     if state['terminated']:
         return jsonify({'allowed': False, 'redirect': 'terminated'})
@@ -273,11 +575,11 @@ def validate_stage_access(token, stage):
     return jsonify({'allowed': True, 'token_state': state, 'session_data': config})
 
 @app.route('/api/test/<token>/update-stage', methods=['POST'])
-def update_stage(token):
+async def update_stage(token):
     data = request.json
     stage = data.get('stage')
     status = data.get('status')
-    state = get_or_create_session_state(token)
+    state = await get_or_create_session_state(token)
 
     if stage in [1, 2, 3]:
         state['stages'][stage] = status
@@ -286,6 +588,7 @@ def update_stage(token):
                 state['current_stage'] = stage + 1
             else:
                 state['completed'] = True
+        await save_session_state(token, state)
 
     return jsonify({'success': True, 'token_state': state})
 
@@ -293,6 +596,8 @@ def update_stage(token):
 
 @app.route('/api/test/<token>/snapshot', methods=['POST'])
 def upload_snapshot(token):
+    # A sync view: the upload is read and written in this request's own thread,
+    # with nothing to await, so it never occupies the event loop
     try:
         if 'snapshot' not in request.files:
             return jsonify({'error': 'No snapshot provided'}), 400
@@ -302,13 +607,8 @@ def upload_snapshot(token):
         if not config:
             return jsonify({"error": "Invalid token"}), 404
 
-        candidate_name = config.get('candidate_name', 'unknown')
-        safe_name = "".join(c for c in candidate_name if c.isalnum() or c in (' ', '-', '_')).rstrip().replace(' ', '_').lower()
-        candidate_dir = os.path.join('interview_logs', safe_name)
-        os.makedirs(candidate_dir, exist_ok=True)
-
         filename = f"cheating_snapshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-        filepath = os.path.join(candidate_dir, filename)
+        filepath = os.path.join(candidate_log_dir(config), filename)
         file.save(filepath)
 
         return jsonify({'success': True, 'filename': filename})
@@ -317,7 +617,7 @@ def upload_snapshot(token):
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/test/<token>/violations', methods=['POST'])
-def record_violation(token):
+async def record_violation(token):
     data = request.json
     violation = {
         'type': data.get('type'),
@@ -325,51 +625,61 @@ def record_violation(token):
         'details': data.get('details', '')
     }
 
-    if token not in session_data['violations']:
-        session_data['violations'][token] = []
-    session_data['violations'][token].append(violation)
-
-    count = len(session_data['violations'][token])
+    count = await add_violation(token)
+    config = load_test_config(token)
+    if config:
+        path = os.path.join(candidate_log_dir(config), 'violations.jsonl')
+        buffer_violation(path, {'token': token, **violation})
     if count >= 10:
-        get_or_create_session_state(token)['terminated'] = True
+        state = await get_or_create_session_state(token)
+        state['terminated'] = True
+        await save_session_state(token, state)
 
     return jsonify({'success': True, 'violation_count': count, 'max_reached': count >= 10})
 
 @app.route('/api/test/<token>/terminate', methods=['POST'])
-def terminate_test(token):
+async def terminate_test(token):
     reason = request.json.get("reason", "No reason provided")
-    state = get_or_create_session_state(token)
+    state = await get_or_create_session_state(token)
     state["terminated"] = True
     state["termination_reason"] = reason
     state["terminated_at"] = datetime.now().isoformat()
+    await save_session_state(token, state)
     return jsonify({"success": True, "message": f"Test terminated: {reason}"})
 
 @app.route('/api/test/<token>/status', methods=['GET'])
-def get_test_status(token):
+async def get_test_status(token):
     config = load_test_config(token)
     if not config:
         return jsonify({'error': 'Invalid token'}), 404
-    state = get_or_create_session_state(token)
+    state = await get_or_create_session_state(token)
     
     # Get interview progress
-    interview_progress = get_interview_progress(token)
+    interview_progress = await get_interview_progress(token)
 
     return jsonify({
         'token': token,
         'candidate_info': config,
         'state': state,
-        'violations': len(session_data.get('violations', {}).get(token, [])),
+        'violations': await violation_count(token),
         'interview_progress': interview_progress
     })
 
 @app.route('/audio/<filename>')
-def serve_audio_file(filename):
-    if '..' in filename or '/' in filename:
-        abort(403)
-    path = os.path.join(tempfile.gettempdir(), filename)
-    if not os.path.exists(path):
+async def serve_audio_file(filename):
+    audio_content = await load_audio(filename)
+    if audio_content is None:
         abort(404)
-    return send_file(path, mimetype='audio/mpeg')
+    # Every clip gets a unique filename, so browsers may cache it for good
+    response = send_file(
+        BytesIO(audio_content),
+        mimetype='audio/mpeg',
+        etag=hashlib.md5(audio_content).hexdigest(),
+        max_age=AUDIO_TTL
+    )
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
 
 @app.route("/api/health")
 def health():
@@ -391,6 +701,13 @@ def serve_frontend(path):
     # Otherwise, serve index.html (React Router handles /admin, /test/:id, etc.)
     return send_from_directory(DIST_DIR, "index.html") 
 
+# ASGI entry point for production: gunicorn -c gunicorn.conf.py main:asgi_app
+# Views run on a thread pool (a2wsgi rather than asgiref's WsgiToAsgi, which funnels
+# every request through one thread); their OpenAI awaits all share event_loop above.
+ASGI_THREADS = int(os.getenv("ASGI_THREADS", "64"))
+asgi_app = WSGIMiddleware(app, workers=ASGI_THREADS)
+
 if __name__ == '__main__':
+    # Development server only
     os.makedirs("uploads", exist_ok=True)
-    app.run(host='0.0.0.0', port=8000, debug=True)
\ No newline at end of file
+    app.run(host='0.0.0.0', port=8000, debug=os.getenv('FLASK_DEBUG') == '1')
\ No newline at end of file
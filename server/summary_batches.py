@@ -0,0 +1,166 @@
+"""Run interview summaries through the OpenAI Batch API.
+
+generate_final_summary() queues one request per finished interview in
+PENDING_SUMMARIES_PATH. Run this periodically (e.g. hourly from cron):
+
+    python summary_batches.py submit    # upload the queue as a new batch
+    python summary_batches.py collect   # write finished results into the logs
+"""
+import os
+import sys
+import asyncio
+import logging
+from datetime import datetime
+
+import orjson
+
+from generatequestion import client, parse_summary, PENDING_SUMMARIES_PATH
+
+logger = logging.getLogger(__name__)
+
+# One in-flight batch per line: "<batch id>\t<input file>". The input file is kept
+# until the batch is collected so that unfinished requests can be requeued.
+BATCH_IDS_PATH = "summary_batches.txt"
+FINISHED_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def _read_batches() -> list:
+    if not os.path.exists(BATCH_IDS_PATH):
+        return []
+    with open(BATCH_IDS_PATH) as f:
+        return [line.rstrip("\n").partition("\t")[::2] for line in f if line.strip()]
+
+
+def _write_batches(batches: list):
+    with open(BATCH_IDS_PATH, "w") as f:
+        f.writelines(f"{batch_id}\t{batch_path}\n" for batch_id, batch_path in batches)
+
+
+def _read_requests(batch_path: str) -> dict:
+    """The request lines of a submitted batch, keyed by custom_id"""
+    if not batch_path or not os.path.exists(batch_path):
+        logger.warning(f"Input file {batch_path!r} is gone, unfinished requests can't be requeued")
+        return {}
+    with open(batch_path, "rb") as f:
+        return {orjson.loads(line)["custom_id"]: line for line in f if line.strip()}
+
+
+def requeue_requests(lines: list):
+    """Put request lines back in the queue for the next submit"""
+    # Unbuffered, one write per line, so lines never interleave with the server's appends
+    with open(PENDING_SUMMARIES_PATH, "ab", buffering=0) as f:
+        for line in lines:
+            f.write(line if line.endswith(b"\n") else line + b"\n")
+
+
+async def _file_lines(file_id: str) -> list:
+    content = await client.files.content(file_id)
+    return content.text.splitlines()
+
+
+async def submit_pending_summaries():
+    """Upload the queued requests and start a batch for them"""
+    if not os.path.exists(PENDING_SUMMARIES_PATH):
+        logger.info("No pending summaries")
+        return
+
+    # Move the queue aside so interviews finishing meanwhile start a fresh one
+    batch_path = f"{PENDING_SUMMARIES_PATH}.{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    os.replace(PENDING_SUMMARIES_PATH, batch_path)
+
+    try:
+        with open(batch_path, "rb") as f:
+            input_file = await client.files.create(file=f, purpose="batch")
+        batch = await client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+    except Exception:
+        # Nothing tracks the moved-aside file until the batch exists, so put its
+        # requests back in the queue for the next submit
+        requeue_requests(list(_read_requests(batch_path).values()))
+        os.unlink(batch_path)
+        raise
+    _write_batches(_read_batches() + [(batch.id, batch_path)])
+    logger.info(f"Submitted summary batch {batch.id}")
+
+
+def apply_summary(log_path: str, summary: str):
+    """Write a finished summary into its interview log"""
+    if not os.path.exists(log_path):
+        logger.warning(f"Interview log {log_path} no longer exists, dropping its summary")
+        return
+    with open(log_path, "rb") as f:
+        log_data = orjson.loads(f.read())
+    log_data["summary"] = parse_summary(summary)
+    with open(log_path, "wb") as f:
+        f.write(orjson.dumps(log_data, option=orjson.OPT_INDENT_2))
+
+
+def apply_result(result: dict):
+    """Apply one batch output line; returns its custom_id if it needs no retry"""
+    custom_id = result["custom_id"]
+    response = result.get("response") or {}
+    if response.get("status_code") != 200:
+        logger.error(f"Summary for {custom_id} failed: {result.get('error') or response.get('body')}")
+        return None
+    choice = response["body"]["choices"][0]
+    message = choice["message"]
+    if message.get("refusal"):
+        # A retry would be refused again, so keep the refusal as the summary text
+        logger.warning(f"Summary for {custom_id} was refused: {message['refusal']}")
+        apply_summary(custom_id, message["refusal"])
+        return custom_id
+    if choice["finish_reason"] != "stop" or message.get("content") is None:
+        # A truncated response can't satisfy the schema
+        logger.error(f"Summary for {custom_id} ended with {choice['finish_reason']} and no usable content")
+        return None
+    apply_summary(custom_id, message["content"])
+    return custom_id
+
+
+async def collect_finished_batches():
+    """Apply the results of every batch that has finished.
+
+    Requests without a usable result (failed lines, or every line of a batch that
+    failed validation, expired or was cancelled) are requeued for the next submit.
+    """
+    still_running = []
+    for batch_id, batch_path in _read_batches():
+        batch = await client.batches.retrieve(batch_id)
+        if batch.status not in FINISHED_STATUSES:
+            still_running.append((batch_id, batch_path))
+            continue
+        if batch.errors and batch.errors.data:
+            logger.error(f"Summary batch {batch_id} ended as {batch.status}: {batch.errors.data}")
+        unfinished = _read_requests(batch_path)
+
+        for line in await _file_lines(batch.output_file_id) if batch.output_file_id else []:
+            # One bad line must not stop the rest of the batch (or later batches) from
+            # being applied; its request stays unfinished and is requeued
+            try:
+                custom_id = apply_result(orjson.loads(line))
+            except Exception:
+                logger.exception(f"Failed to apply a result from summary batch {batch_id}: {line[:200]}")
+                continue
+            if custom_id:
+                unfinished.pop(custom_id, None)
+
+        for line in await _file_lines(batch.error_file_id) if batch.error_file_id else []:
+            logger.error(f"Summary request failed in batch {batch_id}: {line[:500]}")
+
+        if unfinished:
+            requeue_requests(list(unfinished.values()))
+            logger.warning(f"Requeued {len(unfinished)} summaries from batch {batch_id}")
+        if os.path.exists(batch_path):
+            os.unlink(batch_path)
+        logger.info(f"Collected summary batch {batch_id}")
+    _write_batches(still_running)
+
+
+if __name__ == "__main__":
+    commands = {"submit": submit_pending_summaries, "collect": collect_finished_batches}
+    if len(sys.argv) != 2 or sys.argv[1] not in commands:
+        sys.exit(f"usage: {sys.argv[0]} {{{'|'.join(commands)}}}")
+    asyncio.run(commands[sys.argv[1]]())